@@ -2,15 +2,86 @@ import argparse
 # While one could use sys.argv to process arguments directly, the "argparse" 
 # package makes it exceedingly easy to provide short and long options, as well
 # as document the proper usage of those arguments through --help
-from glob import glob
-# The "glob" package makes UNIX-style path patterns available in Python,
-# simplifying the path logic significantly
 from datetime import datetime # Timestamps
 from typing import TextIO # Type hints for file objects
-from os import path, makedirs, rmdir, remove # Path and create/removal helpers
+from os import path, makedirs, rmdir, remove, scandir
+# Path and create/removal helpers, plus scandir for directory traversal
+import os # sendfile and fstat for the fast copy path
+import sys # Direct stdout access for batched log output
 import shutil # Copying operations
-from time import sleep # Sleep operations
-from pathlib import Path # Path object
+from concurrent.futures import ThreadPoolExecutor # Parallel file copies
+import threading # Event used as an interruptible sleep
+import signal # Graceful shutdown on SIGINT/SIGTERM
+import asyncio # Overlapping the two tree scans
+
+# Generator yielding every entry below root as an os.DirEntry.
+# scandir() fills in the file type from the directory listing itself,
+# so entry.is_dir() can usually answer without an extra stat syscall -
+# unlike glob, which stats every entry it returns.
+# An explicit stack of pending directories keeps the traversal
+# iterative; a recursive version would hold one generator frame per
+# nesting level and hit the recursion limit on pathological trees
+def _scan(root: str):
+    pending = [root]
+    while pending:
+        with scandir(pending.pop()) as it:
+            for entry in it:
+                yield entry
+                if entry.is_dir(follow_symlinks=False):
+                    pending.append(entry.path)
+
+BUFSIZE = 1024 * 1024
+# Buffer size for the read/write fallback below. shutil defaults to
+# 64KB, but a 1 MiB buffer issues 16x fewer syscalls per megabyte
+# and benchmarks consistently faster on local filesystems
+
+if sys.platform == 'win32':
+    import ctypes
+    # On Windows the kernel-side equivalent of sendfile for file-to-file
+    # copies is CopyFileExW, which pumps the data inside the kernel and
+    # carries attributes and timestamps over in the same call, so no
+    # separate copystat pass is needed
+    def _fastcopy(src: str, dst: str):
+        if not ctypes.windll.kernel32.CopyFileExW(src, dst,
+                                                  None, None, None, 0):
+            raise ctypes.WinError()
+else:
+    # Copy file data with os.sendfile, which moves the bytes entirely in
+    # kernel space instead of shuttling them through a Python-level
+    # read/write buffer. Metadata is copied separately with copystat so
+    # the synchronized file keeps the original timestamps, like copy2 did
+    def _fastcopy(src: str, dst: str):
+        with open(src, 'rb') as f_in, open(dst, 'wb') as f_out:
+            try:
+                size = os.fstat(f_in.fileno()).st_size
+                sent = 0
+                while sent < size:
+                    n = os.sendfile(f_out.fileno(), f_in.fileno(),
+                                    sent, size - sent)
+                    if n == 0:
+                        break
+                    sent += n
+            except OSError:
+                # sendfile is unavailable on some filesystem
+                # combinations, so fall back to a plain read/write loop
+                f_in.seek(0)
+                f_out.seek(0)
+                shutil.copyfileobj(f_in, f_out, BUFSIZE)
+        shutil.copystat(src, dst)
+
+# Condense (relative path, DirEntry) pairs into a plain dictionary of
+# rel_path -> (is_dir, size, mtime_ns) tuples. Directories carry no
+# size/mtime since the comparison logic never looks at them
+def _entry_state(rel_entries) -> dict:
+    state = {}
+    for rel_path, entry in rel_entries:
+        if entry.is_dir():
+            state[rel_path] = (True, 0, 0)
+        else:
+            entry_stat = entry.stat()
+            state[rel_path] = (False, entry_stat.st_size,
+                               entry_stat.st_mtime_ns)
+    return state
 
 # Function to return prematurely if any of the provided folders do not exist
 def valid_folder(folder_name: str):
@@ -19,137 +90,211 @@ def valid_folder(folder_name: str):
             "{0} does not exist".format(folder_name))
     return folder_name
 
-def synchronize_folders(original_path: str, synchronized_path: str) -> dict:
+async def synchronize_folders(original_path: str, synchronized_path: str,
+                        synchronized_state: dict = None) -> tuple[dict, dict]:
     actions = {}
     # Action dictionary to log information of which folders and files
     # have been created/removed/copied
-    original_content = glob(f"{original_path}/**", recursive= True)[1:]
-    synchronized_content = glob(f"{synchronized_path}/**", recursive= True)[1:]
-    # Could include hidden folders, but the parameter was only added in
-    # Python 3.11 and so is omitted.
-    # I'm also not sure what is the proper use to handle symlinks,
+    original_join = original_path.rstrip(os.sep) + os.sep
+    synchronized_join = synchronized_path.rstrip(os.sep) + os.sep
+    original_prefix = len(original_join)
+    synchronized_prefix = len(synchronized_join)
+    # Every path yielded by _scan(root) starts with "root/", so slicing
+    # off that prefix gives the relative path directly, without
+    # path.relpath's per-call normalization and splitting work.
+    # The same prefixes are reused below to build absolute paths by
+    # plain concatenation, instead of formatting a fresh f-string on
+    # every loop iteration
+
+    def scan_original():
+        return {e.path[original_prefix:]: e
+                for e in _scan(original_path)}
+    # Dictionary mapping paths relative to the given root
+    # (like "file1.txt" or "folder1/file2.txt") to their DirEntry,
+    # so the loops below can ask is_dir() without fresh stat calls.
+    # I'm not sure what is the proper use to handle symlinks,
     # but I'm assuming this is outside the scope of the task
-    
-    # glob returns a list like so: 
-    # ["*original_path*/file1.txt","*original_path*/folder1/file2.txt"].
-    
-    rel_original_content = [path.relpath(p, original_path) for p
-                            in original_content]
-    rel_synchronized_content = [path.relpath(p, synchronized_path) for p
-                            in synchronized_content]
-    # Returns a list like so:
-    # [file1.txt, folder1/file2.txt]
-    set_original_content = set(rel_original_content)
-    set_synchronized_content = set(rel_synchronized_content)
-    actions['created'] = list(set_original_content - set_synchronized_content)
-    actions['removed'] = list(set_synchronized_content - set_original_content)
-    actions['copied']  = list(set_original_content.intersection
-                              (set_synchronized_content))
+
+    def scan_synchronized():
+        return _entry_state((e.path[synchronized_prefix:], e)
+                            for e in _scan(synchronized_path))
+
+    if synchronized_state is None:
+        original_entries, synchronized_state = await asyncio.gather(
+            asyncio.to_thread(scan_original),
+            asyncio.to_thread(scan_synchronized))
+        # Each scan is a long run of blocking metadata syscalls, so
+        # running them on two threads lets the traversals overlap -
+        # a real win when the folders live on different devices or on
+        # high-latency network mounts
+    else:
+        original_entries = scan_original()
+    # A completed cycle leaves the synchronized tree as an exact mirror
+    # of the source tree, so the state returned by the previous call
+    # stands in for a fresh scan of the destination - halving the
+    # traversal work on every cycle but the first. This does assume
+    # nothing else modifies the synchronized folder between cycles;
+    # passing synchronized_state=None always forces a real scan
+
+    original_content = original_entries.keys()
+    synchronized_content = synchronized_state.keys()
+    # Dictionary key views support set operations directly, so no
+    # intermediate set copies of the path collections are needed
+    actions['created'] = list(original_content - synchronized_content)
+    actions['removed'] = list(synchronized_content - original_content)
+    actions['copied']  = list(original_content & synchronized_content)
     # This set logic relies on the fact that every file path is unique -
     # an assumption that has to be true for any copy/delete/create
     # operation to be functioning in the first place
     
-    for file_path in sorted(actions['created'], 
-                            key= lambda fp: len(Path(fp).parents)):
-        # Here we are sorting based on the depth of the folder or file
-        # Sorting makes the order of operations much easier seeing as
-        # you always create folders before creating the files within them
-        
-        src_path = f"{original_path}/{file_path}"
-        dst_path = f"{synchronized_path}/{file_path}"
-        if path.isdir(src_path):
-            makedirs(dst_path)
+    copy_jobs = []
+    # (src, dst) pairs of file copies collected from the created and
+    # copied phases below, executed in parallel once all the
+    # destination directories exist
+
+    created_dirs = []
+    for file_path in actions['created']:
+        if original_entries[file_path].is_dir():
+            created_dirs.append(file_path)
         else:
-            shutil.copy2(src_path, dst_path)
-        
-        # copy2() retains metadata such as when the file was created
-        # and modified. Seeing as we are to maintain a full identical copy
-        # I'm assuming this is in order
-        
-    for file_path in (fp for fp in actions['copied'] 
-                      if len(Path(fp).parents) == 1):
-        # Because copytree() copies the entire tree of the given directory,
-        # we are only interested in the files and folders that are in the root
-        # directory. We therefore filter the file path list before we continue
-        
-        src_path = f"{original_path}/{file_path}"
-        dst_path = f"{synchronized_path}/{file_path}"
-        if path.isdir(src_path):
-            shutil.copytree(src_path, dst_path, dirs_exist_ok = True)
+            copy_jobs.append((original_join + file_path,
+                              synchronized_join + file_path))
+    # Partitioning directories from files in one pass reuses the
+    # is_dir() answer cached on each DirEntry, and only the directory
+    # list still needs the depth sort - the copies run after all
+    # directories exist, so their order is irrelevant
+
+    for file_path in sorted(created_dirs,
+                            key= lambda fp: fp.count(os.sep)):
+        # Sorting by depth (counted as separators, so no Path object is
+        # built per element) makes the order of operations much easier
+        # seeing as you always create folders before the files within them
+        makedirs(synchronized_join + file_path, exist_ok = True)
+        # exist_ok makes the call a no-op for ancestors that makedirs
+        # already created, instead of raising FileExistsError
+
+    # _fastcopy() retains metadata such as when the file was created
+    # and modified. Seeing as we are to maintain a full identical copy
+    # I'm assuming this is in order
+
+    for file_path in actions['copied']:
+        # Every entry below a copied directory already has its own entry
+        # in the 'copied' list, so each one is handled directly here
+        # rather than delegating whole subtrees to copytree(), which
+        # would traverse the same tree all over again
+
+        src_path = original_join + file_path
+        dst_path = synchronized_join + file_path
+        if original_entries[file_path].is_dir():
+            makedirs(dst_path, exist_ok = True)
         else:
-            shutil.copy2(src_path, dst_path)
-    
-    # Above I made the choice to overwrite any existing folders and files
-    # The advantages to this approach is that it's reduntantly foolproof -
-    # it easily retains any metadata and any changes to the content inside
-    # the files, which might be harder to track.
-    # However, if files are large, the synchronization interval is low,
-    # or resources are constrained, the redundancy might be very costly.
-    # Another approach in that case could be to track whether the file or folder
-    # has been modified, and only follow through with the overwrite if it has
+            original_stat = original_entries[file_path].stat()
+            _, synchronized_size, synchronized_mtime_ns = \
+                synchronized_state[file_path]
+            if (original_stat.st_size == synchronized_size and
+                original_stat.st_mtime_ns == synchronized_mtime_ns):
+                continue
+            copy_jobs.append((src_path, dst_path))
+
+    # Since _fastcopy() preserves timestamps, a file whose size and
+    # modification time both match its synchronized twin has not changed
+    # since the last cycle, and rewriting it would be pure wasted I/O.
+    # DirEntry.stat() serves these values from the scan pass, so the
+    # comparison costs no extra syscalls. This is the same size+mtime
+    # heuristic rsync uses; it can in principle be fooled by a change
+    # that preserves both, but for folder synchronization that tradeoff
+    # is well established
+
+    if copy_jobs:
+        with ThreadPoolExecutor(max_workers =
+                                min(32, (os.cpu_count() or 1) * 4)) as ex:
+            list(ex.map(lambda job: _fastcopy(*job), copy_jobs))
+    # Each copy spends most of its time in syscalls that release the
+    # GIL, so a thread pool keeps several transfers in flight at once
+    # and presents the disk with a full queue. Directory creation and
+    # removal stay sequential because they are order-dependent
+    # (parents before children and vice versa)
     
-    for file_path in sorted(actions['removed'], reverse = True,
-                        key= lambda fp: len(Path(fp).parents)):
+    removed_entries = [(fp, synchronized_state[fp][0])
+                       for fp in actions['removed']]
+    # Pairing each removed path with the is_dir answer already recorded
+    # in the state, so the loop below needs no stat calls at all
+
+    for file_path, is_dir in sorted(removed_entries, reverse = True,
+                        key= lambda entry: entry[0].count(os.sep)):
         # Reversing the order of the sort because we want to delete a file
-        # before deleting the folder containing it
-        
-        src_path = f"{original_path}/{file_path}"
-        dst_path = f"{synchronized_path}/{file_path}"
-        
-        if not path.isdir(dst_path):
+        # before deleting the folder containing it. Counting separators
+        # gives the same depth ordering as Path(fp).parents without
+        # allocating a Path object per element
+
+        dst_path = synchronized_join + file_path
+
+        if not is_dir:
             remove(dst_path)
         else:
             rmdir(dst_path)
-    
-    return actions
+
+    return actions, _entry_state(original_entries.items())
+    # The source state as of this scan doubles as the synchronized
+    # state for the next cycle, since the trees are now identical
         
 # Helper function to reduce excessive nesting for readability
-def log_and_print(actions: dict[str, list], f: TextIO):
-    for action_key in actions.keys():
-        for action_path in actions[action_key]:
-            now = datetime.now().replace(microsecond=0)
-            action_string = (f"{now} {action_key.capitalize()}"
-                        f" file with file path {action_path}")
-            f.write(f"{action_string}\n")
-            print(action_string)
+def log_and_print(actions: dict[str, list], f: TextIO, cycle_time: str):
+    lines = [(f"{cycle_time} {action_key.capitalize()}"
+              f" file with file path {action_path}\n")
+             for action_key in actions.keys()
+             for action_path in actions[action_key]]
+    # All actions belong to the same sync cycle, so they share the
+    # timestamp taken when the cycle started - no clock_gettime or
+    # datetime allocation per entry. Joining the lines and writing them
+    # in one go means one write call per stream instead of two per action
+    buffer = ''.join(lines)
+    f.write(buffer)
+    sys.stdout.write(buffer)
             
 
-def log_and_print_actions(actions: dict, log_path: str):
+def log_and_print_actions(actions: dict, log_path: str, cycle_time: str):
     with open(f"{log_path}/sync_log.txt", 'w') as f:
-        pass
-    # Above I'm choosing to delete the contents of the old log file before 
-    # writing to it. 
+        log_and_print(actions, f, cycle_time)
+    # Opening in 'w' mode already truncates any old contents, so one
+    # open both clears the previous log and writes the new one.
     # Another solution could be to instead preserve old log files
     # and create new ones like sync_log_1.txt, sync_log_2.txt etc. on
     # different runs of the program with the same log folder
-    with open(f"{log_path}/sync_log.txt", 'a') as f:
-        log_and_print(actions, f)
         
 
 def synchronization_loop(original_path: str, synchronized_path: str,
-                         log_path: str, 
+                         log_path: str,
                          synchronization_interval_seconds: int):
-    while True:
-        now = datetime.now().replace(microsecond=0)
-        print(f"{now} Started synchronization from {original_path} to " 
+    stop = threading.Event()
+    signal.signal(signal.SIGINT, lambda signum, frame: stop.set())
+    signal.signal(signal.SIGTERM, lambda signum, frame: stop.set())
+    # Unlike a plain sleep(), waiting on an Event that the signal
+    # handlers set means SIGINT or SIGTERM wakes the loop immediately
+    # instead of after up to a full interval, and the current cycle is
+    # always allowed to finish before exiting - so a signal can no
+    # longer interrupt a copy halfway and corrupt the synchronized
+    # folder
+
+    synchronized_state = None
+    # None on the first cycle forces a real scan of the synchronized
+    # folder; afterwards each cycle hands its end state to the next
+
+    while not stop.is_set():
+        cycle_time = datetime.now().replace(microsecond=0).isoformat(' ')
+        # One timestamp string per cycle, shared by the progress
+        # messages and every log line the cycle produces
+        print(f"{cycle_time} Started synchronization from {original_path} to "
               f"{synchronized_path} with a synchronization interval of "
               f"{synchronization_interval_seconds} seconds")
-        actions = synchronize_folders(original_path, synchronized_path)
-        log_and_print_actions(actions, log_path)
-        print(f"{now} Synchronization complete")
-        sleep(synchronization_interval_seconds)
-        # Note that there are several downsides to using "sleep":
-        # 1) sleep is blocking, so any SIGINT or SIGTERM sent will wait
-        # until the sleep is finished before exiting the program
-        # 2) Any SIGINT or SIGTERM sent while the program is copying files
-        # might lead to data corruption in the synchronized folder
-        
-        # A proper solution could be to use some kind of threading,
-        # catch any signals, and then do some sort of data integrity check
-        # based on the contents of the original folder before exiting gracefully
-        
-        # I'm assuming this is outside of the scope of the task, and assuming
-        # the "perfect" use of the program
+        actions, synchronized_state = asyncio.run(synchronize_folders(
+            original_path, synchronized_path, synchronized_state))
+        # synchronize_folders is a coroutine so the two tree scans can
+        # overlap; the surrounding loop stays plain blocking code
+        log_and_print_actions(actions, log_path, cycle_time)
+        print(f"{cycle_time} Synchronization complete")
+        if stop.wait(synchronization_interval_seconds):
+            break
 
 if __name__ == "__main__":
     parser = argparse.ArgumentParser(description=